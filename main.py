@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 
@@ -16,9 +17,8 @@ from src.crawler.nadarzyn_bip.parser import (
     SearchPageResultsParser,
 )
 from src.html_generator import HTMLGenerator
-from src.item_repository import ItemRepository
+from src.item_repository import ITEM_COLUMNS, ITEM_DTYPES, ItemRepository
 from src.mail_service import MailService
-from src.models import ContentItem
 
 # Load environment variables from .env file
 load_dotenv()
@@ -28,18 +28,21 @@ SMTP_PASS = os.getenv("SMTP_PASS")  # App Password (16 characters)
 TO_GROUP = os.getenv("TO_GROUP")  # Target group email address
 
 RESULTS_FILE = "items.csv"
+CRAWL_CONCURRENCY = 4  # Maximum number of parallel requests to the BIP server
+CRAWL_REQUESTS_PER_SECOND = 1 / 1.5  # Maximum request rate to the BIP server: one request every 1.5 s
 
 logger = logging.getLogger("main")
 
 
 def read_past_csv():
     try:
-        return pd.read_csv(RESULTS_FILE)
+        # Missing values and extra cells are handled by ItemRepository.from_dataframe, like in the report loader
+        return pd.read_csv(RESULTS_FILE, dtype=ITEM_DTYPES, keep_default_na=False, index_col=False)
     except FileNotFoundError:
-        return pd.DataFrame(columns=[*ContentItem.model_fields.keys()])
+        return pd.DataFrame(columns=ITEM_COLUMNS)
 
 
-def run():
+def run(concurrency: int = CRAWL_CONCURRENCY):
     if not SMTP_USER or not SMTP_PASS or not TO_GROUP:
         raise RuntimeError("SMTP_USER, SMTP_PASS and TO_GROUP environment variables must be set and non-empty.")
 
@@ -59,22 +62,27 @@ def run():
             ArticleParser(),
             ArticleAttachmentParser(),
             ListAttachmentParser(),
-            FullArticleParser(),
         ],
+        fallback_parser=FullArticleParser(),
+        concurrency=concurrency,
+        requests_per_second=CRAWL_REQUESTS_PER_SECOND,
     )
-    crawled_items = crawler.crawl()
-    new_data = [item for item in crawled_items if not item_repository.exists(item)]
+    crawled_items = asyncio.run(crawler.crawl())
+    new_data = item_repository.filter_new(crawled_items)
 
     if len(new_data) > 0:
         logger.info(f"New items found! Saving to {RESULTS_FILE}")
-        item_repository.add_items(new_data)
-        item_repository.to_dataframe().to_csv(RESULTS_FILE, index=False)
+        # Append only the new rows instead of rewriting the whole history
+        ItemRepository(new_data).to_dataframe().to_csv(
+            RESULTS_FILE, mode="a", header=not os.path.exists(RESULTS_FILE), index=False
+        )
 
         html_output = html_generator.generate_from_csv(csv_path=RESULTS_FILE, output_path="gh-pages/index.html")
         logger.info(f"HTML report generated: {html_output}")
 
         email_content = html_generator.generate_email_content(new_data)
-        mail_service.send_to_group(TO_GROUP, email_content)
+        with mail_service:
+            mail_service.send_to_group(TO_GROUP, email_content)
         logger.info(f"Email sent to {TO_GROUP} with {len(new_data)} new items.")
     else:
         logger.info("No new items found.")
@@ -2,22 +2,27 @@ import re
 from datetime import datetime
 from typing import Optional
 
-DATETIME_PATTERNS: list[tuple[re.Pattern, str]] = [
-    (re.compile(r"\b(\d{2}\.\d{2}\.\d{4})\b"), "%d.%m.%Y"),
-    (re.compile(r"\b(\d{4}-\d{2}-\d{2})\b"), "%Y-%m-%d"),
-    (re.compile(r"\b(\d{4}-\d{2}-\d{2} \d{2}:\d{2})\b"), "%Y-%m-%d %H:%M"),
-]
+# One pass over the text for all supported formats: DD.MM.YYYY or YYYY-MM-DD (an optional HH:MM suffix is ignored)
+DATETIME_PATTERN = re.compile(r"\b(?:(?P<dmy>\d{2}\.\d{2}\.\d{4})|(?P<ymd>\d{4}-\d{2}-\d{2}))\b")
+DMY_PATTERN = re.compile(r"\b(?P<dmy>\d{2}\.\d{2}\.\d{4})\b")
 
 
 def extract_datetime(text: Optional[str]) -> Optional[datetime]:
     """Extract a datetime object from text using known patterns."""
     if not text:
         return None
-    for pattern, date_format in DATETIME_PATTERNS:
-        match = pattern.search(text)
-        if match:
-            try:
-                return datetime.strptime(match.group(1), date_format)
-            except ValueError:
-                return None
-    return None
+    match = DATETIME_PATTERN.search(text)
+    if not match:
+        return None
+    if match.lastgroup == "ymd":
+        # A DD.MM.YYYY date later in the text still takes precedence over a YYYY-MM-DD one
+        match = DMY_PATTERN.search(text, match.start()) or match
+    try:
+        # Slicing the fixed-width groups is much cheaper than datetime.strptime
+        if match.lastgroup == "dmy":
+            dmy = match["dmy"]
+            return datetime(int(dmy[6:10]), int(dmy[3:5]), int(dmy[0:2]))
+        ymd = match["ymd"]
+        return datetime(int(ymd[0:4]), int(ymd[5:7]), int(ymd[8:10]))
+    except ValueError:
+        return None
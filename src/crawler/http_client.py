@@ -1,4 +1,7 @@
+import asyncio
+import time
 from typing import Dict, Optional
+from urllib.parse import urlparse
 
 import httpx
 
@@ -7,21 +10,52 @@ HttpResponse = httpx.Response
 HEADERS = {"User-Agent": "KajetanyWatcher/1.0 (+kajetany.bip.bot@gmail.com)"}
 
 
-class HttpClient:
-    def __init__(self):
-        self.client = httpx.Client(follow_redirects=True)
+class RateLimiter:
+    """Token bucket limiting the number of requests per second sent to each host."""
+
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive.")
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets: Dict[str, tuple[float, float]] = {}  # host -> (tokens, last refill time)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, host: str) -> None:
+        """Wait until a request to the host is allowed and take a token for it."""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                tokens, last_refill = self._buckets.get(host, (float(self.burst), now))
+                tokens = min(float(self.burst), tokens + (now - last_refill) * self.requests_per_second)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait_time = (1 - tokens) / self.requests_per_second
+            await asyncio.sleep(wait_time)
+
 
-    def __enter__(self):
-        self.client.__enter__()
+class HttpClient:
+    def __init__(self, max_connections: int = 8, requests_per_second: float = 1 / 1.5):
+        self.client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+    async def __aenter__(self):
+        await self.client.__aenter__()
         return self
 
-    def __exit__(self, *args):
-        return self.client.__exit__(*args)
+    async def __aexit__(self, *args):
+        return await self.client.__aexit__(*args)
 
-    def fetch(self, url: str, additional_headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+    async def fetch(self, url: str, additional_headers: Optional[Dict[str, str]] = None) -> HttpResponse:
         headers = HEADERS.copy()
         if additional_headers:
             headers.update(additional_headers)
-        r = self.client.get(url, headers=headers, timeout=20)
+        await self.rate_limiter.acquire(urlparse(url).netloc)
+        r = await self.client.get(url, headers=headers, timeout=20)
         r.raise_for_status()
         return r
@@ -1,15 +1,86 @@
 import abc
 import logging
 from datetime import datetime
-from typing import Generator, Optional
-from urllib.parse import urljoin, urlparse
+from typing import Optional
 
 from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 from src.crawler.datetime_extractor import extract_datetime
+from src.crawler.url_manipulation import resolve_url
 from src.models import ContentItem, ItemMetadata, RedirectItem
 
 
+class CSSSelectors:
+    """CSS selectors used throughout the parsers."""
+
+    PUBLICATION_DATE = ".data_publikacji .system_metryka_wartosc"
+    CREATION_DATE = ".autor_data .system_metryka_wartosc"
+    MODIFICATION_DATE = ".data_mod .system_metryka_wartosc"
+    METADATA_VALUE = ".system_metryka_wartosc"
+    ARTICLE_TITLE = "h3"
+    ANCHOR = "a[href]"
+    ARTICLE_NODE = ".obiekt_akapit"
+    AUCTION_EVENT_NODE = ".przetargi_zdarzenie"
+    AUCTION_EVENT_TITLE = ".przetargi_tytul"
+    AUCTION_ATTACHMENT_NODE = ".przetargi_zalaczniki_li"
+    CONTAINER_NODE = ".obiekt_pliki"
+    FILE_LINK = ".pliki_link"
+    AUCTION_FILE_LINK = ".przetargi_zalacznik_link"
+    SEARCH_RESULTS = "#PageContent ol.szukaj_wyniki li"
+    SEARCH_TITLE = ".szukaj_tytul > a"
+    SEARCH_SNIPPET = ".szukaj_wyniki_snippet"
+    SEARCH_LINK = "cite"
+    MORE_LINK = "a.wyswietl_wiecej_link"
+    BRIEF_ARTICLE = ".akapit_skrot"
+    ANTI_CSRF_INPUT = "input[name='_session_antiCSRF']"
+
+
+class CSSClasses:
+    """CSS class names used when walking up from a node to its container."""
+
+    ARTICLE = "obiekt_akapit"
+    AUCTION_EVENT = "przetargi_zdarzenie"
+    CONTAINER = "obiekt_pliki"
+
+
+# Maps the class of a metadata row to the ItemMetadata field holding its value
+METADATA_CLASSES = {
+    "data_publikacji": "published_at",
+    "autor_data": "created_at",
+    "data_mod": "last_modified_at",
+}
+
+
+class ParseContext:
+    """A fetched page shared by all parsers while it is dispatched and parsed.
+
+    Document-level selector lookups are memoized, so parsers probing the same
+    selector in `can_parse` and `parse` walk the tree only once.
+    """
+
+    def __init__(self, url: str, dom: LexborHTMLParser) -> None:
+        self.url = url
+        self.dom = dom
+        self.anchor = url.partition("#")[2]  # Same as urlparse(url).fragment without building a ParseResult
+        self._css_cache: dict[str, Optional[LexborNode]] = {}
+
+    @property
+    def anchor_node(self) -> Optional[LexborNode]:
+        """The element the URL fragment points to, if any."""
+        return self.css_first(f"#{self.anchor}") if self.anchor else None
+
+    @property
+    def article_node(self) -> Optional[LexborNode]:
+        """The first article node of the page."""
+        return self.css_first(CSSSelectors.ARTICLE_NODE)
+
+    def css_first(self, selector: str) -> Optional[LexborNode]:
+        """Return the first node in the document matching the selector."""
+        if selector not in self._css_cache:
+            self._css_cache[selector] = self.dom.css_first(selector)
+        return self._css_cache[selector]
+
+
 class BaseParser(abc.ABC):
     """Abstract base class for parsing content from websites.
 
@@ -21,27 +92,25 @@ class BaseParser(abc.ABC):
         self.logger = logging.getLogger("parser")
 
     @abc.abstractmethod
-    def can_parse(self, url: str, dom: LexborHTMLParser) -> bool:
-        """Determine if this parser can handle the given URL and DOM.
+    def can_parse(self, ctx: ParseContext) -> bool:
+        """Determine if this parser can handle the given page.
 
         Args:
-            url: The URL to check
-            dom: The parsed HTML DOM
+            ctx: The page URL and its parsed HTML DOM
         Returns:
             True if this parser can handle the URL, False otherwise
         """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def parse(
-        self, url: str, dom: LexborHTMLParser
-    ) -> Generator[Optional[ContentItem | RedirectItem | None], None, None]:
-        """Parse the given DOM and return an ContentItem or RedirectItem object.
+    def parse(self, ctx: ParseContext) -> list[Optional[ContentItem | RedirectItem]]:
+        """Parse the given page and return the ContentItem or RedirectItem objects found on it.
 
         Args:
-            dom: The parsed HTML DOM
+            ctx: The page URL and its parsed HTML DOM
         Returns:
-            An ContentItem or RedirectItem object if parsing is successful, None otherwise
+            A list of ContentItem or RedirectItem objects (None for entries that could not be parsed),
+            empty if parsing is not successful
         """
         raise NotImplementedError
 
@@ -55,43 +124,63 @@ class BaseParser(abc.ABC):
 
     def _extract_title(self, node: Optional[LexborNode], default: str = "Brak tytułu") -> str:
         """Extract title from h3 element."""
-        title_node = self._safe_get_node(node, "h3")
+        title_node = self._safe_get_node(node, CSSSelectors.ARTICLE_TITLE)
         return self._get_node_text_or_default(title_node) or default
 
     def _get_anchor_href(self, node: Optional[LexborNode], url: str) -> Optional[str]:
         """Extract href from anchor node."""
-        anchor_node = self._safe_get_node(node, "a[href]")
+        anchor_node = self._safe_get_node(node, CSSSelectors.ANCHOR)
         href = anchor_node.attributes.get("href") if anchor_node else None
-        href_parts = urlparse(href) if href else None
-        full_url = urljoin(url, href) if href_parts and not href_parts.netloc else href
-
-        return full_url
-
-    def _get_anchor_from_url(self, url: str) -> str:
-        """Extract anchor from URL fragment."""
-        return urlparse(url).fragment
+        if not href:
+            return None
+        # Protocol-relative links are stored as they are, matching the attachment URLs already in the history
+        if href.startswith("//"):
+            return href
+        return resolve_url(url, href)
+
+    def _find_ancestor(self, node: Optional[LexborNode], class_name: str) -> Optional[LexborNode]:
+        """Return the closest ancestor of the node having the given CSS class."""
+        parent = node.parent if node else None
+        while parent is not None:
+            if class_name in (parent.attributes.get("class") or "").split():
+                return parent
+            parent = parent.parent
+        return None
 
     def _extract_metadata(self, node: Optional[LexborNode]) -> ItemMetadata:
         """Extract publication, creation and modification dates from article node.
 
+        All metadata values are collected in a single traversal and assigned to a field
+        based on the class of their metadata row.
+
         Args:
             node: The article node to extract metadata from
 
         Returns:
-            Tuple of (published_at, created_at, last_modified_at)
+            ItemMetadata with published_at, created_at and last_modified_at
         """
         if not node:
             return ItemMetadata()
 
-        published_at = self._get_date(node, ".data_publikacji .system_metryka_wartosc")
-        created_at = self._get_date(node, ".autor_data .system_metryka_wartosc")
-        last_modified_at = self._get_date(node, ".data_mod .system_metryka_wartosc")
-
-        return ItemMetadata(published_at=published_at, created_at=created_at, last_modified_at=last_modified_at)
-
-    def _get_date(self, node: Optional[LexborNode], selector: str) -> Optional[datetime]:
-        """Helper to return date from a node using a selector."""
-        return extract_datetime(self._get_node_text_or_default(self._safe_get_node(node, selector)))
+        dates: dict[str, Optional[datetime]] = {}
+        for value_node in node.css(CSSSelectors.METADATA_VALUE):
+            field = self._get_metadata_field(value_node, node)
+            if field and field not in dates:
+                dates[field] = extract_datetime(self._get_node_text_or_default(value_node))
+
+        return ItemMetadata(**dates)
+
+    def _get_metadata_field(self, value_node: LexborNode, root: LexborNode) -> Optional[str]:
+        """Find the metadata field of a value node by walking up to its metadata row."""
+        parent = value_node.parent
+        while parent is not None:
+            for class_name in (parent.attributes.get("class") or "").split():
+                if class_name in METADATA_CLASSES:
+                    return METADATA_CLASSES[class_name]
+            if parent == root:
+                break
+            parent = parent.parent
+        return None
 
     def _get_node_text_content_or_default(
         self, node: Optional[LexborNode], default: Optional[str] = None
@@ -1,11 +1,11 @@
+import asyncio
 import logging
-import time
-from typing import Generator
+from typing import Optional
 
 from selectolax.lexbor import LexborHTMLParser
 
-from src.crawler.http_client import HttpClient
-from src.crawler.nadarzyn_bip.base_parser import BaseParser
+from src.crawler.http_client import HttpClient, HttpResponse
+from src.crawler.nadarzyn_bip.base_parser import BaseParser, ParseContext
 from src.models import ContentItem, RedirectItem
 
 
@@ -16,73 +16,112 @@ class Crawler:
     with their respective parser implementations.
     """
 
-    def __init__(self, base_url: str, parsers: list[BaseParser]) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        parsers: list[BaseParser],
+        fallback_parser: Optional[BaseParser] = None,
+        concurrency: int = 4,
+        requests_per_second: float = 1 / 1.5,
+    ) -> None:
         """Initialize crawler with URL-parser mappings.
 
         Args:
             base_url: The base URL for the crawler
             parsers: List of parser instances to use for crawling
+            fallback_parser: Parser used without a can_parse check when none of `parsers` matches
+            concurrency: Maximum number of requests in flight at the same time
+            requests_per_second: Maximum request rate per host, to be respectful to the server
         """
         self.logger = logging.getLogger("crawler")
         self.base_url = base_url
         self.parsers = parsers
+        self.fallback_parser = fallback_parser
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
 
-    def crawl(self) -> list[ContentItem]:
-        """Crawl all configured URLs and return new items.
+    async def crawl(self) -> list[ContentItem]:
+        """Crawl the base URL and every redirect found on the way.
 
-        Args:
-            past_items: List of previously found items
+        Redirects discovered on one level are fetched concurrently, bounded by `concurrency`.
 
         Returns:
-            DataFrame containing newly found items
+            List of parsed content items
         """
         new_items: list[ContentItem] = []
         items_to_crawl: list[RedirectItem] = [RedirectItem(url=self.base_url)]
-
-        with HttpClient() as client:
-            for item_to_crawl in items_to_crawl:
-                for item in self.crawl_url(item_to_crawl.url, client):
-                    if item is None:
-                        self.logger.warning(f"Parser returned no item for {item_to_crawl.url}")
-                        continue
-                    if isinstance(item, RedirectItem):
-                        self.logger.info(f"Found redirect to {item.url}, adding to crawl list")
-                        items_to_crawl.append(item)
-                        continue
-
-                    merged_item = item.merge_with_redirect(item_to_crawl)
-
-                    self.logger.info(f"Item parsed:\n{merged_item}")
-                    new_items.append(merged_item)
-
-                self.logger.info("")
-                time.sleep(1.5)  # Be respectful to the server
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with HttpClient(max_connections=self.concurrency, requests_per_second=self.requests_per_second) as client:
+            while items_to_crawl:
+                results = await asyncio.gather(
+                    *(self.crawl_url(item_to_crawl.url, client, semaphore) for item_to_crawl in items_to_crawl)
+                )
+
+                next_items_to_crawl: list[RedirectItem] = []
+                for item_to_crawl, items in zip(items_to_crawl, results):
+                    for item in items:
+                        if item is None:
+                            self.logger.warning("Parser returned no item for %s", item_to_crawl.url)
+                            continue
+                        if isinstance(item, RedirectItem):
+                            self.logger.info("Found redirect to %s, adding to crawl list", item.url)
+                            next_items_to_crawl.append(item)
+                            continue
+
+                        merged_item = item.merge_with_redirect(item_to_crawl)
+
+                        # The item repr is only built when INFO is enabled
+                        self.logger.info("Item parsed:\n%s", merged_item)
+                        new_items.append(merged_item)
+
+                    self.logger.info("")
+                items_to_crawl = next_items_to_crawl
 
         return new_items
 
-    def crawl_url(self, url: str, client: HttpClient) -> Generator[ContentItem | RedirectItem | None]:
+    async def crawl_url(
+        self, url: str, client: HttpClient, semaphore: asyncio.Semaphore
+    ) -> list[ContentItem | RedirectItem | None]:
         resolved_url = url
         try:
-            self.logger.info(f"Fetching URL: {url}")
-            response = client.fetch(url)
+            async with semaphore:
+                self.logger.info("Fetching URL: %s", url)
+                response = await client.fetch(url)
             resolved_url = str(response.url)
 
-            dom = LexborHTMLParser(response.text)
+            dom = self._parse_html(response)
+            ctx = ParseContext(resolved_url, dom)
 
             # Determine the appropriate parser for the content
             parser = None
             for p in self.parsers:
-                if p.can_parse(resolved_url, dom):
+                if p.can_parse(ctx):
                     parser = p
                     break
+            else:
+                parser = self.fallback_parser
 
             if parser is None:
-                self.logger.warning(f"No suitable parser found for {resolved_url}")
-                return None
+                self.logger.warning("No suitable parser found for %s", resolved_url)
+                return []
 
-            self.logger.info(f"Using parser: {parser.__class__.__name__}")
-            yield from parser.parse(resolved_url, dom)
+            self.logger.info("Using parser: %s", parser.__class__.__name__)
+            return parser.parse(ctx)
 
         except Exception as e:
-            self.logger.error(f"Failed to crawl {resolved_url}: {e}")
-            return None
+            self.logger.error("Failed to crawl %s: %s", resolved_url, e)
+            return []
+
+    @staticmethod
+    def _parse_html(response: HttpResponse) -> LexborHTMLParser:
+        """Build the DOM of a response, honouring the charset of the Content-Type header."""
+        charset = response.charset_encoding
+        if charset is None:
+            # Without a declared charset, lexbor detects a BOM or <meta charset> in the raw body itself
+            return LexborHTMLParser(response.content, encoding=True)
+        if charset.lower().replace("_", "-") in ("utf-8", "utf8"):
+            # The header takes precedence over a conflicting <meta charset>, so detection stays off
+            return LexborHTMLParser(response.content, encoding=False)
+        # lexbor ignores HTTP headers, so let httpx decode bodies in other declared charsets
+        return LexborHTMLParser(response.text)
@@ -1,47 +1,26 @@
-from typing import Generator, Optional
-from urllib.parse import urljoin, urlparse, urlunparse
+from typing import Optional
+from urllib.parse import quote_plus
 
-from selectolax.lexbor import LexborHTMLParser, LexborNode
+from selectolax.lexbor import LexborNode
 
-from src.crawler.nadarzyn_bip.base_parser import BaseParser
-from src.crawler.url_manipulation import parse_url_components, reconstruct_url
+from src.crawler.nadarzyn_bip.base_parser import BaseParser, CSSClasses, CSSSelectors, ParseContext
+from src.crawler.url_manipulation import get_origin, parse_url_components, reconstruct_url, resolve_url
 from src.models import ContentItem, RedirectItem
 
 
-class CSSSelectors:
-    """CSS selectors used throughout the parsers."""
-
-    PUBLICATION_DATE = ".data_publikacji .system_metryka_wartosc"
-    CREATION_DATE = ".autor_data .system_metryka_wartosc"
-    MODIFICATION_DATE = ".data_mod .system_metryka_wartosc"
-    ARTICLE_TITLE = "h3"
-    ARTICLE_NODE = ".obiekt_akapit"
-    AUCTION_EVENT_NODE = ".przetargi_zdarzenie"
-    AUCTION_EVENT_TITLE = ".przetargi_tytul"
-    AUCTION_ATTACHMENT_NODE = ".przetargi_zalaczniki_li"
-    CONTAINER_NODE = ".obiekt_pliki"
-    FILE_LINK = ".pliki_link"
-    AUCTION_FILE_LINK = ".przetargi_zalacznik_link"
-    SEARCH_RESULTS = "#PageContent ol.szukaj_wyniki li"
-    SEARCH_TITLE = ".szukaj_tytul > a"
-    SEARCH_SNIPPET = ".szukaj_wyniki_snippet"
-    MORE_LINK = "a.wyswietl_wiecej_link"
-    BRIEF_ARTICLE = ".akapit_skrot"
-    ANTI_CSRF_INPUT = "input[name='_session_antiCSRF']"
-
-
 class SearchPageConfiguratorParser(BaseParser):
-    def can_parse(self, url: str, dom: LexborHTMLParser) -> bool:
-        return "/redir,szukaj" in url and "_session_antiCSRF" not in url
+    def can_parse(self, ctx: ParseContext) -> bool:
+        return "/redir,szukaj" in ctx.url and "_session_antiCSRF" not in ctx.url
 
-    def parse(self, url: str, dom: LexborHTMLParser) -> Generator[Optional[RedirectItem], None, None]:
-        sanitized_url = self._sanitize_query_parameters(url)
+    def parse(self, ctx: ParseContext) -> list[Optional[RedirectItem]]:
+        sanitized_url = self._sanitize_query_parameters(ctx.url)
 
-        prepared_url = self._prepare_search_url(sanitized_url, dom)
+        prepared_url = self._prepare_search_url(sanitized_url, ctx)
         if prepared_url and prepared_url != sanitized_url:
             # For the second request, include the referer header to maintain session continuity
             # The httpx client automatically maintains cookies between requests
-            yield RedirectItem(url=prepared_url)
+            return [RedirectItem(url=prepared_url)]
+        return []
 
     def _sanitize_query_parameters(self, url: str) -> str:
         """Remove unnecessary or dynamic query parameters from the URL."""
@@ -49,37 +28,36 @@ class SearchPageConfiguratorParser(BaseParser):
         query_params.pop("_session_antiCSRF", None)  # Remove anti-CSRF token if present
         return reconstruct_url(parsed_url, query_params)
 
-    def _prepare_search_url(self, url: str, dom: LexborHTMLParser) -> Optional[str]:
-        parsed_url, query_params = parse_url_components(url)
-
-        token_input = dom.css_first(CSSSelectors.ANTI_CSRF_INPUT)
-        if token_input:
-            token_value = token_input.attributes.get("value")
-            if token_value:
-                # Add the token to the query parameters
-                query_params["_session_antiCSRF"] = [token_value]
+    def _prepare_search_url(self, url: str, ctx: ParseContext) -> Optional[str]:
+        token_input = ctx.css_first(CSSSelectors.ANTI_CSRF_INPUT)
+        token_value = token_input.attributes.get("value") if token_input else None
+        if not token_value:
+            return url
 
-        return reconstruct_url(parsed_url, query_params)
+        # The sanitized URL never carries a token, so it can simply be appended to the query,
+        # which ends where the fragment starts
+        base, hash_sign, fragment = url.partition("#")
+        separator = "&" if "?" in base else "?"
+        return f"{base}{separator}_session_antiCSRF={quote_plus(token_value)}{hash_sign}{fragment}"
 
 
 class SearchPageResultsParser(BaseParser):
-    def can_parse(self, url: str, dom: LexborHTMLParser) -> bool:
-        return "/redir,szukaj" in url and "_session_antiCSRF" in url
+    def can_parse(self, ctx: ParseContext) -> bool:
+        return "/redir,szukaj" in ctx.url and "_session_antiCSRF" in ctx.url
 
-    def parse(self, url: str, dom: LexborHTMLParser) -> Generator[Optional[RedirectItem], None, None]:
-        for item in dom.css(CSSSelectors.SEARCH_RESULTS):
-            yield self._parse_item(item)
+    def parse(self, ctx: ParseContext) -> list[Optional[RedirectItem]]:
+        return [self._parse_item(item) for item in ctx.dom.css(CSSSelectors.SEARCH_RESULTS)]
 
     def _parse_item(self, item: LexborNode) -> Optional[RedirectItem]:
         title_node = self._safe_get_node(item, CSSSelectors.SEARCH_TITLE)
         title = self._get_node_text_or_default(title_node.first_child if title_node else None) or "Brak tytułu"
-        link = self._get_node_text_or_default(item.css_first("cite"))
+        link = self._get_node_text_or_default(item.css_first(CSSSelectors.SEARCH_LINK))
 
         if not link:
-            self.logger.warning(f"Item missing link, skipping: {title}")
+            self.logger.warning("Item missing link, skipping: %s", title)
             return None
 
-        self.logger.info(f"Found link in list: \n{title} \n -> {link}")
+        self.logger.info("Found link in list: \n%s \n -> %s", title, link)
         description = self._get_node_text_or_default(self._safe_get_node(item, CSSSelectors.SEARCH_SNIPPET))
 
         return RedirectItem(
@@ -91,180 +69,179 @@ class SearchPageResultsParser(BaseParser):
 
 
 class ArticleParser(BaseParser):
-    def can_parse(self, url: str, dom: LexborHTMLParser) -> bool:
-        anchor = self._get_anchor_from_url(url)
-        return "akapit_" in anchor
+    def can_parse(self, ctx: ParseContext) -> bool:
+        return "akapit_" in ctx.anchor
 
-    def parse(self, url: str, dom: LexborHTMLParser) -> Generator[Optional[ContentItem], None, None]:
-        anchor = self._get_anchor_from_url(url)
-        article_node = dom.css_first(f"#{anchor}")
+    def parse(self, ctx: ParseContext) -> list[Optional[ContentItem]]:
+        article_node = ctx.anchor_node
 
         if not article_node:
-            self.logger.warning(f"Article node not found for anchor: {anchor}")
-            return
+            self.logger.warning("Article node not found for anchor: %s", ctx.anchor)
+            return []
 
         title = self._extract_title(article_node)
         metadata = self._extract_metadata(article_node)
 
-        yield ContentItem(main_title=title, title=title, description=None, url=url, **metadata.model_dump())
+        return [ContentItem(main_title=title, title=title, description=None, url=ctx.url, **metadata.model_dump())]
 
 
 class ArticleAttachmentParser(BaseParser):
-    def can_parse(self, url: str, dom: LexborHTMLParser) -> bool:
-        anchor = self._get_anchor_from_url(url)
-        return "plik_" in anchor and dom.css_first(f"{CSSSelectors.ARTICLE_NODE} #{anchor}") is not None
+    def can_parse(self, ctx: ParseContext) -> bool:
+        return "plik_" in ctx.anchor and self._find_ancestor(ctx.anchor_node, CSSClasses.ARTICLE) is not None
 
-    def parse(self, url: str, dom: LexborHTMLParser) -> Generator[Optional[ContentItem], None, None]:
-        anchor = self._get_anchor_from_url(url)
-        article_node = dom.css_first(CSSSelectors.ARTICLE_NODE)
+    def parse(self, ctx: ParseContext) -> list[Optional[ContentItem]]:
+        article_node = ctx.article_node
 
         if not article_node:
-            self.logger.warning(f"Article node not found for attachment: {anchor}")
-            return
+            self.logger.warning("Article node not found for attachment: %s", ctx.anchor)
+            return []
 
         article_title = self._extract_title(article_node)
-        attachment_node = self._safe_get_node(article_node, f"#{anchor}")
+        attachment_node = self._safe_get_node(article_node, f"#{ctx.anchor}")
         attachment_name = (
             self._get_node_text_or_default(self._safe_get_node(attachment_node, CSSSelectors.FILE_LINK)) or "Brak nazwy"
         )
-        attachment_url = self._get_anchor_href(attachment_node, url)
+        attachment_url = self._get_anchor_href(attachment_node, ctx.url)
 
         metadata = self._extract_metadata(article_node)
 
-        yield ContentItem(
-            main_title=article_title,
-            title=attachment_name,
-            description=None,
-            url=url,
-            attachment_url=attachment_url,
-            **metadata.model_dump(),
-        )
+        return [
+            ContentItem(
+                main_title=article_title,
+                title=attachment_name,
+                description=None,
+                url=ctx.url,
+                attachment_url=attachment_url,
+                **metadata.model_dump(),
+            )
+        ]
 
 
 class AuctionAttachmentParser(BaseParser):
-    def can_parse(self, url: str, dom: LexborHTMLParser) -> bool:
-        anchor = self._get_anchor_from_url(url)
+    def can_parse(self, ctx: ParseContext) -> bool:
         return (
-            "przetargi_zdarzenie_plik_" in anchor
-            and dom.css_first(f"{CSSSelectors.AUCTION_EVENT_NODE} #{anchor}") is not None
+            "przetargi_zdarzenie_plik_" in ctx.anchor
+            and self._find_ancestor(ctx.anchor_node, CSSClasses.AUCTION_EVENT) is not None
         )
 
-    def parse(self, url: str, dom: LexborHTMLParser) -> Generator[Optional[ContentItem], None, None]:
-        anchor = self._get_anchor_from_url(url)
-        container_node = dom.css_first(f"{CSSSelectors.AUCTION_EVENT_NODE}:has(#{anchor})")
+    def parse(self, ctx: ParseContext) -> list[Optional[ContentItem]]:
+        attachment_node = ctx.anchor_node
+        container_node = self._find_ancestor(attachment_node, CSSClasses.AUCTION_EVENT)
 
         if not container_node:
-            self.logger.warning(f"Container node not found for attachment: {anchor}")
-            return
+            self.logger.warning("Container node not found for attachment: %s", ctx.anchor)
+            return []
 
         article_title = (
             self._get_node_text_or_default(self._safe_get_node(container_node, CSSSelectors.AUCTION_EVENT_TITLE))
             or "Brak tytułu"
         )
-        attachment_node = self._safe_get_node(container_node, f"#{anchor}")
         attachment_name = (
             self._get_node_text_or_default(self._safe_get_node(attachment_node, CSSSelectors.AUCTION_FILE_LINK))
             or "Brak nazwy"
         )
-        attachment_url = self._get_anchor_href(attachment_node, url)
+        attachment_url = self._get_anchor_href(attachment_node, ctx.url)
 
         metadata = self._extract_metadata(attachment_node)
 
-        yield ContentItem(
-            main_title=article_title,
-            title=attachment_name,
-            description=None,
-            url=url,
-            attachment_url=attachment_url,
-            **metadata.model_dump(),
-        )
+        return [
+            ContentItem(
+                main_title=article_title,
+                title=attachment_name,
+                description=None,
+                url=ctx.url,
+                attachment_url=attachment_url,
+                **metadata.model_dump(),
+            )
+        ]
 
 
 class ListAttachmentParser(BaseParser):
-    def can_parse(self, url: str, dom: LexborHTMLParser) -> bool:
-        anchor = self._get_anchor_from_url(url)
-        return ("plik_" in anchor or "pliki_" in anchor) and dom.css_first(
-            f"{CSSSelectors.ARTICLE_NODE} #{anchor}"
+    def can_parse(self, ctx: ParseContext) -> bool:
+        anchor = ctx.anchor
+        return ("plik_" in anchor or "pliki_" in anchor) and self._find_ancestor(
+            ctx.anchor_node, CSSClasses.ARTICLE
         ) is None
 
-    def parse(self, url: str, dom: LexborHTMLParser) -> Generator[Optional[ContentItem], None, None]:
-        anchor = self._get_anchor_from_url(url)
+    def parse(self, ctx: ParseContext) -> list[Optional[ContentItem]]:
+        # A single file ("plik_") sits inside a file list; a file list ("pliki_") is the container itself
+        attachment_node = ctx.anchor_node
         container_node = (
-            dom.css_first(f"{CSSSelectors.CONTAINER_NODE}:has(#{anchor})")
-            if "plik_" in anchor
-            else dom.css_first(f"#{anchor}")
+            self._find_ancestor(attachment_node, CSSClasses.CONTAINER) if "plik_" in ctx.anchor else attachment_node
         )
 
         if not container_node:
-            self.logger.warning(f"Container node not found for attachment: {anchor}")
-            return
+            self.logger.warning("Container node not found for attachment: %s", ctx.anchor)
+            return []
 
         article_title = self._extract_title(container_node)
-        attachment_node = self._safe_get_node(container_node, f"#{anchor}")
         attachment_name = (
             self._get_node_text_or_default(self._safe_get_node(attachment_node, CSSSelectors.FILE_LINK)) or "Brak nazwy"
         )
-        attachment_url = self._get_anchor_href(attachment_node, url)
+        attachment_url = self._get_anchor_href(attachment_node, ctx.url)
 
         metadata = self._extract_metadata(container_node)
 
-        yield ContentItem(
-            main_title=article_title,
-            title=attachment_name,
-            description=None,
-            url=url,
-            attachment_url=attachment_url,
-            **metadata.model_dump(),
-        )
+        return [
+            ContentItem(
+                main_title=article_title,
+                title=attachment_name,
+                description=None,
+                url=ctx.url,
+                attachment_url=attachment_url,
+                **metadata.model_dump(),
+            )
+        ]
 
 
 class ArticleBriefParser(BaseParser):
-    def can_parse(self, url: str, dom: LexborHTMLParser) -> bool:
-        anchor = self._get_anchor_from_url(url)
-        brief_selector = f"{CSSSelectors.ARTICLE_NODE}#{anchor} {CSSSelectors.BRIEF_ARTICLE}"
-        return "akapit_" in anchor and dom.css_first(brief_selector) is not None
+    def can_parse(self, ctx: ParseContext) -> bool:
+        return "akapit_" in ctx.anchor and ctx.css_first(self._brief_selector(ctx)) is not None
 
-    def parse(self, url: str, dom: LexborHTMLParser) -> Generator[Optional[RedirectItem], None, None]:
-        parsed_url = urlparse(url)
-        anchor = parsed_url.fragment
-        base_url = urlunparse((parsed_url.scheme, parsed_url.netloc, "", "", "", ""))  # URL base
-        article_node = dom.css_first(f"{CSSSelectors.ARTICLE_NODE}#{anchor} {CSSSelectors.BRIEF_ARTICLE}")
+    def parse(self, ctx: ParseContext) -> list[Optional[RedirectItem]]:
+        base_url = get_origin(ctx.url)
+        article_node = ctx.css_first(self._brief_selector(ctx))
 
         if not article_node:
-            self.logger.warning(f"Brief article node not found for anchor: {anchor} at {url}")
-            return
+            self.logger.warning("Brief article node not found for anchor: %s at %s", ctx.anchor, ctx.url)
+            return []
 
         more_link = self._safe_get_node(article_node, CSSSelectors.MORE_LINK)
         more_link_url = more_link.attributes.get("href") if more_link else None
         if not more_link_url:
-            self.logger.warning(f"Item missing 'read more' link, skipping: {url}")
-            return
+            self.logger.warning("Item missing 'read more' link, skipping: %s", ctx.url)
+            return []
 
         title = self._extract_title(article_node)
 
-        yield RedirectItem(
-            main_title=title,
-            title=title,
-            description=None,
-            url=urljoin(base_url, more_link_url),
-            published_at=None,
-            created_at=None,
-            last_modified_at=None,
-        )
+        return [
+            RedirectItem(
+                main_title=title,
+                title=title,
+                description=None,
+                url=resolve_url(base_url, more_link_url),
+                published_at=None,
+                created_at=None,
+                last_modified_at=None,
+            )
+        ]
+
+    def _brief_selector(self, ctx: ParseContext) -> str:
+        return f"{CSSSelectors.ARTICLE_NODE}#{ctx.anchor} {CSSSelectors.BRIEF_ARTICLE}"
 
 
 class FullArticleParser(BaseParser):
-    def can_parse(self, url: str, dom: LexborHTMLParser) -> bool:
+    def can_parse(self, ctx: ParseContext) -> bool:
         return True
 
-    def parse(self, url: str, dom: LexborHTMLParser) -> Generator[Optional[ContentItem], None, None]:
-        article_node = dom.css_first(CSSSelectors.ARTICLE_NODE)
+    def parse(self, ctx: ParseContext) -> list[Optional[ContentItem]]:
+        article_node = ctx.article_node
 
         if not article_node:
             self.logger.warning("Article node not found in full article parser")
-            return
+            return []
 
         title = self._extract_title(article_node)
         metadata = self._extract_metadata(article_node)
 
-        yield ContentItem(main_title=title, title=title, description=None, url=url, **metadata.model_dump())
+        return [ContentItem(main_title=title, title=title, description=None, url=ctx.url, **metadata.model_dump())]
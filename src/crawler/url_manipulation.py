@@ -1,4 +1,5 @@
-from urllib.parse import ParseResult, parse_qs, urlencode, urlparse, urlunparse
+import re
+from urllib.parse import ParseResult, parse_qs, quote_plus, urljoin, urlparse, urlunparse
 
 
 def parse_url_components(url: str) -> tuple[ParseResult, dict]:
@@ -8,9 +9,46 @@ def parse_url_components(url: str) -> tuple[ParseResult, dict]:
     return parsed_url, query_params
 
 
+def encode_query(query_params: dict) -> str:
+    """Encode query parameters the same way as urlencode(query_params, doseq=True).
+
+    Only string values and sequences of strings, as returned by parse_qs, are supported, which keeps
+    the loop free of urlencode's generic type checks.
+    """
+    pairs = []
+    for key, values in query_params.items():
+        encoded_key = quote_plus(key)
+        if isinstance(values, str):
+            values = (values,)
+        pairs.extend(f"{encoded_key}={quote_plus(value)}" for value in values)
+    return "&".join(pairs)
+
+
 def reconstruct_url(parsed_url: ParseResult, query_params: dict) -> str:
     """Reconstruct URL from parsed components and query parameters."""
-    new_query = urlencode(query_params, doseq=True)
+    new_query = encode_query(query_params)
     return urlunparse(
         (parsed_url.scheme, parsed_url.netloc, parsed_url.path, parsed_url.params, new_query, parsed_url.fragment)
     )
+
+
+ORIGIN_PATTERN = re.compile(r"^[^:/?#]+://[^/?#]*")
+
+
+def get_origin(url: str) -> str:
+    """Return the scheme and host part of an absolute URL, e.g. "https://bip.nadarzyn.pl"."""
+    match = ORIGIN_PATTERN.match(url)
+    return match.group(0) if match else url
+
+
+def resolve_url(base_url: str, href: str) -> str:
+    """Resolve a link against the page URL.
+
+    Absolute and root-relative links, which are almost all links on BIP pages, are handled with
+    plain string operations; only other relative forms go through urljoin.
+    """
+    if href.startswith(("http://", "https://")):
+        return href
+    if href.startswith("/") and not href.startswith("//"):
+        return get_origin(base_url) + href
+    return urljoin(base_url, href)
@@ -11,18 +11,35 @@ Usage:
 """
 
 import datetime
-import locale
+import functools
 import logging
 from collections import defaultdict
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import pandas as pd
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from src.item_repository import ItemRepository
 from src.models import ContentItem
 
+# Month names in the genitive case, as used in Polish dates. Formatting with them directly avoids
+# switching the process-wide LC_TIME locale for every rendered date.
+POLISH_MONTHS = (
+    "stycznia",
+    "lutego",
+    "marca",
+    "kwietnia",
+    "maja",
+    "czerwca",
+    "lipca",
+    "sierpnia",
+    "września",
+    "października",
+    "listopada",
+    "grudnia",
+)
+
 
 class HTMLGenerator:
     """
@@ -40,68 +57,51 @@ class HTMLGenerator:
             templates_dir: Path to the directory containing Jinja2 templates
         """
         self.templates_dir = Path(templates_dir)
-        self.env = Environment(
-            loader=FileSystemLoader(self.templates_dir), autoescape=select_autoescape(["html", "xml"])
+        self.env = self._get_environment(self.templates_dir)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_environment(cls, templates_dir: Path) -> Environment:
+        """Return the Jinja2 environment for a templates directory, shared by all generators using it."""
+        # Templates are not edited while the generator is in use, so Jinja can skip checking them for changes
+        env = Environment(
+            loader=FileSystemLoader(templates_dir),
+            autoescape=select_autoescape(["html", "xml"]),
+            auto_reload=False,
+            cache_size=-1,
         )
 
         # Add custom filters
-        self.env.filters["datetime_format"] = self._datetime_format
-        self.env.filters["date_format"] = self._date_format
-        self.env.filters["polish_date_format"] = self._polish_date_format
-        self.env.filters["truncate"] = self._truncate_text
-        self.env.filters["entry_type"] = self._get_entry_type
+        env.filters["datetime_format"] = cls._datetime_format
+        env.filters["date_format"] = cls._date_format
+        env.filters["polish_date_format"] = cls._polish_date_format
+        env.filters["truncate"] = cls._truncate_text
+        env.filters["entry_type"] = cls._get_entry_type
+        return env
 
     @staticmethod
+    @functools.lru_cache(maxsize=2048)
     def _datetime_format(value: datetime.datetime, format_str: str = "%d.%m.%Y %H:%M") -> str:
-        """Custom filter for datetime formatting."""
+        """Custom filter for datetime formatting, cached per value and format."""
         if value is None:
             return "Nieznana"
         return value.strftime(format_str)
 
     @staticmethod
+    @functools.lru_cache(maxsize=2048)
     def _date_format(value: datetime.date, format_str: str = "%d.%m.%Y") -> str:
-        """Custom filter for date formatting."""
+        """Custom filter for date formatting, cached per value and format."""
         if value is None:
             return "Nieznana"
         return value.strftime(format_str)
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def _polish_date_format(value: datetime.date) -> str:
-        """Format date to Polish format using locale."""
+        """Format date to Polish format, e.g. "5 marca 2024". Results are cached, as many items share a date."""
         if value is None:
             return "Nieznana"
-
-        # Save current locale
-        original_locale = locale.getlocale(locale.LC_TIME)
-        try:
-            # Try to set Polish locale
-            locale.setlocale(locale.LC_TIME, "pl_PL.UTF-8")
-            return value.strftime("%-d %B %Y")
-        except locale.Error:
-            HTMLGenerator.logger.warning("Polish locale 'pl_PL.UTF-8' not available. The string mapping method.")
-            # Fallback: manual month mapping
-            months_pl = [
-                "stycznia",
-                "lutego",
-                "marca",
-                "kwietnia",
-                "maja",
-                "czerwca",
-                "lipca",
-                "sierpnia",
-                "września",
-                "października",
-                "listopada",
-                "grudnia",
-            ]
-            month = months_pl[value.month - 1]
-            return f"{value.day} {month} {value.year}"
-        finally:
-            # Always restore original locale
-            try:
-                locale.setlocale(locale.LC_TIME, original_locale)
-            except (locale.Error, TypeError):
-                pass
+        return f"{value.day} {POLISH_MONTHS[value.month - 1]} {value.year}"
 
     @staticmethod
     def _truncate_text(value: str, length: int = 200, end: str = "...") -> str:
@@ -128,32 +128,18 @@ class HTMLGenerator:
         Returns:
             List of tuples (date_string, main_title, items_list) sorted by date descending
         """
-        # First group by date
-        items_by_date = defaultdict(list)
+        # Group by date and main_title in a single pass
+        groups: Dict[tuple[str, str], List[ContentItem]] = defaultdict(list)
 
         for item in items:
             # Get the most relevant date for grouping
             item_date = item.last_modified_at or item.created_at or item.published_at
             if item_date:
-                date_str = item_date.strftime("%Y-%m-%d")
-                items_by_date[date_str].append(item)
-
-        # Now group by main_title within each date and flatten the structure
-        result = []
-        for date_str in sorted(items_by_date.keys(), reverse=True):
-            items_for_date = items_by_date[date_str]
-
-            # Group by main_title
-            items_by_title = defaultdict(list)
-            for item in items_for_date:
-                main_title = item.main_title or "Różne"
-                items_by_title[main_title].append(item)
+                groups[(item_date.isoformat(), item.main_title or "Różne")].append(item)
 
-            # Add each group as a separate tuple
-            for main_title in sorted(items_by_title.keys()):
-                result.append((date_str, main_title, items_by_title[main_title]))
-
-        return result
+        # Order by date descending, then by main_title; the second sort is stable and keeps titles ordered
+        keys = sorted(sorted(groups), key=itemgetter(0), reverse=True)
+        return [(date_str, main_title, groups[(date_str, main_title)]) for date_str, main_title in keys]
 
     def generate_report(
         self,
@@ -178,32 +164,30 @@ class HTMLGenerator:
 
         # Group items by date for timeline display
         items_by_date = self._group_items_by_date_and_main_title(items)
-        print(items_by_date)
+        self.logger.debug("Items grouped into %d date and title groups", len(items_by_date))
 
         # Prepare template context
+        now = datetime.datetime.now()
         context = {
             "page_title": "Biuletyn Informacji Publicznej - Nadarzyn",
             "subtitle": "Automatyczny monitoring komunikatów i ogłoszeń dla Kajetan",
             "items": items,
             "items_by_date": items_by_date,
-            "last_updated": datetime.datetime.now().strftime("%d.%m.%Y"),
-            "generation_time": datetime.datetime.now(),
+            "last_updated": now.strftime("%d.%m.%Y"),
+            "generation_time": now,
         }
 
         # Add custom context if provided
         if custom_context:
             context.update(custom_context)
 
-        # Render template
-        html_content = template.render(**context)
-
         # Ensure output directory exists
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write HTML file
+        # Render the template straight into the file instead of building the whole page in memory first
         with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html_content)
+            template.stream(**context).dump(f)
 
         return str(output_file)
 
@@ -227,9 +211,7 @@ class HTMLGenerator:
             Path to the generated HTML file
         """
         # Read CSV data
-        df = pd.read_csv(csv_path)
-
-        item_repository = ItemRepository.from_dataframe(df)
+        item_repository = ItemRepository.from_csv(csv_path)
 
         return self.generate_report(
             items=item_repository.items,
@@ -1,41 +1,136 @@
+import csv
+import datetime
 import logging
+import sys
+from typing import Any, Iterable, Mapping
 
 import pandas as pd
 
 from src.models import ContentItem
 
+# Column order of the persisted items file
+ITEM_COLUMNS = (
+    "url",
+    "main_title",
+    "title",
+    "description",
+    "attachment_url",
+    "published_at",
+    "created_at",
+    "last_modified_at",
+)
+# Text columns are declared up front so pandas does not have to infer their types
+ITEM_DTYPES = {column: "string" for column in ("url", "main_title", "title", "description", "attachment_url")}
+# Columns holding required ContentItem fields
+REQUIRED_COLUMNS = ("url", "main_title", "title")
+# Columns holding dates, stored in ISO format
+DATE_COLUMNS = ("published_at", "created_at", "last_modified_at")
+# Cell values read as missing: the tokens pandas.read_csv treats as NaN by default
+MISSING_VALUES = frozenset(
+    {
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    }
+)
+
+
+def item_from_row(row: Mapping[Any, Any]) -> ContentItem:
+    """Build an item from a row of the items file.
+
+    Both loaders go through this function, so a row gives the same item whether it was read with pandas
+    or with csv.DictReader:
+    - only the item columns are used, extra cells are ignored;
+    - empty cells, NaN and the pandas NA tokens (e.g. "NA", "N/A", "None") are missing values;
+    - a missing required text value is kept as the string "None";
+    - dates are parsed from ISO format, a malformed date raises ValueError.
+
+    Args:
+        row: Mapping of column name to cell value
+
+    Returns:
+        The ContentItem stored in the row
+    """
+    fields: dict[str, Any] = {}
+    for column in ITEM_COLUMNS:
+        value = row.get(column)
+        if _is_missing(value):
+            value = "None" if column in REQUIRED_COLUMNS else None
+        elif column in DATE_COLUMNS:
+            value = _to_date(value)
+        else:
+            value = str(value)
+        fields[column] = value
+
+    # The values are normalised to the field types above, so the pydantic validators are skipped
+    return ContentItem.model_construct(**fields)
+
+
+def _is_missing(value: Any) -> bool:
+    if isinstance(value, str):
+        return value in MISSING_VALUES
+    return value is None or bool(pd.isna(value))
+
+
+def _to_date(value: Any) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
 
 class ItemRepository:
     @classmethod
     def from_dataframe(cls, df: pd.DataFrame) -> "ItemRepository":
         """Create a new repository from a DataFrame."""
-        items = []
-        for _, row in df.iterrows():
-            row_dict = {k: (None if pd.isna(v) else v) for k, v in row.to_dict().items()}
-            item = ContentItem(
-                url=str(row_dict["url"]),
-                main_title=str(row_dict["main_title"]),
-                title=str(row_dict["title"]),
-                description=row_dict.get("description"),
-                attachment_url=row_dict.get("attachment_url"),
-                published_at=row_dict.get("published_at"),
-                created_at=row_dict.get("created_at"),
-                last_modified_at=row_dict.get("last_modified_at"),
-            )
-            items.append(item)
-        return cls(items)
+        records = df.reindex(columns=list(ITEM_COLUMNS)).astype(object).to_dict(orient="records")
+        repository = cls()
+        repository.add_items(item_from_row(record) for record in records)
+        return repository
+
+    @classmethod
+    def from_csv(cls, csv_path: str) -> "ItemRepository":
+        """Create a new repository from a CSV file written by `to_dataframe().to_csv()`."""
+        repository = cls()
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            # Rows are turned into items and deduplicated while the file is read, so neither the raw rows
+            # nor an intermediate item list are held in memory
+            repository.add_items(item_from_row(row) for row in csv.DictReader(f))
+        return repository
 
     def __init__(self, items: list[ContentItem] | None = None):
         self.logger = logging.getLogger("item_repository")
         self._items: list[ContentItem] = []
+        self._keys: set[tuple] = set()
 
         if items:
             self.add_items(items)
 
     @property
     def items(self) -> list[ContentItem]:
-        """Get all items (read-only access)."""
-        return self._items.copy()
+        """Get all items (read-only access).
+
+        The internal list is returned without copying it, so it must not be modified; use `add_item`,
+        `add_items` or `clear` instead.
+        """
+        return self._items
 
     @property
     def count(self) -> int:
@@ -44,44 +139,65 @@ class ItemRepository:
 
     def add_item(self, item: ContentItem) -> bool:
         """Add an item to the repository. Returns True if added, False if duplicate."""
-        if not self.exists(item):
-            self._items.append(item)
+        if self._add(item):
             self.logger.debug(f"Item added: {item.url}")
             return True
-        else:
-            self.logger.debug(f"Duplicate item ignored: {item.url}")
-            return False
+        self.logger.debug(f"Duplicate item ignored: {item.url}")
+        return False
 
     def exists(self, item: ContentItem) -> bool:
         """Check if an item exists by comparing all fields."""
-        return any(existing_item == item for existing_item in self._items)
+        return self._item_key(item) in self._keys
 
-    def add_items(self, items: list[ContentItem]) -> int:
+    def filter_new(self, items: list[ContentItem]) -> list[ContentItem]:
+        """Return the items that are not in the repository yet, keeping their order and dropping repeats."""
+        new_items = []
+        batch_keys: set[tuple] = set()
+        for item in items:
+            key = self._item_key(item)
+            if key in self._keys or key in batch_keys:
+                continue
+            batch_keys.add(key)
+            new_items.append(item)
+        return new_items
+
+    def add_items(self, items: Iterable[ContentItem]) -> int:
         """Add multiple items. Returns count of items actually added."""
-        added_count = 0
+        # Bulk loads skip the per-item debug messages of add_item, which are formatted even when not emitted
+        count_before = len(self._items)
         for item in items:
-            if self.add_item(item):
-                added_count += 1
+            self._add(item)
+        added_count = len(self._items) - count_before
+        self.logger.debug("%d items added", added_count)
         return added_count
 
     def clear(self) -> None:
         """Clear all items from the repository."""
         self._items.clear()
+        self._keys.clear()
         self.logger.debug("All items cleared from repository")
 
+    def _add(self, item: ContentItem) -> bool:
+        """Store the item unless it is a duplicate. Returns True if it was added."""
+        # Items share a handful of main titles, so one string object is kept per title
+        item.main_title = sys.intern(item.main_title)
+        key = self._item_key(item)
+        if key in self._keys:
+            return False
+        self._items.append(item)
+        self._keys.add(key)
+        return True
+
+    @staticmethod
+    def _item_key(item: ContentItem) -> tuple:
+        """Build a hashable key made of all item fields, used for duplicate detection."""
+        return tuple(getattr(item, field) for field in ContentItem.model_fields)
+
     def to_dataframe(self) -> pd.DataFrame:
         """Convert repository items to a DataFrame."""
+        # Collect each column in one pass instead of dumping every item to a dict
         return pd.DataFrame(
+            {column: [getattr(item, column) for item in self._items] for column in ITEM_COLUMNS},
             # Ensure the columns are in the correct order
-            columns=[
-                "url",
-                "main_title",
-                "title",
-                "description",
-                "attachment_url",
-                "published_at",
-                "created_at",
-                "last_modified_at",
-            ],
-            data=[item.model_dump() for item in self._items],
+            columns=ITEM_COLUMNS,
         )
@@ -1,8 +1,16 @@
 import datetime
+import logging
 import smtplib
 import ssl
 from email.message import EmailMessage
 
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
+MAX_MESSAGES_PER_CONNECTION = 50  # Reconnect after this many messages to stay under server session limits
+
+# Loading the CA bundle is relatively expensive, so the context is created once and shared by all connections
+_SSL_CONTEXT = ssl.create_default_context()
+
 
 class MailService:
     def __init__(self, user: str, password: str):
@@ -10,6 +18,15 @@ class MailService:
             raise ValueError("User and password must be set.")
         self.user = user
         self.password = password
+        self.logger = logging.getLogger("mail_service")
+        self._smtp: smtplib.SMTP_SSL | None = None
+        self._messages_on_connection = 0
+
+    def __enter__(self) -> "MailService":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
     def send_to_group(self, to_group: str, email_content: str) -> None:
         date = datetime.date.today().strftime("%d.%m.%Y")
@@ -20,7 +37,36 @@ class MailService:
         msg["To"] = to_group
         msg.set_content(email_content, subtype="html")
 
-        context = ssl.create_default_context()
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as s:
-            s.login(self.user, self.password)
-            s.send_message(msg)
+        self._get_smtp().send_message(msg)
+        self._messages_on_connection += 1
+
+    def close(self) -> None:
+        """Close the SMTP session if one is open."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        finally:
+            self._smtp = None
+
+    def _get_smtp(self) -> smtplib.SMTP_SSL:
+        """Return a logged-in SMTP session, reusing the open one while it is healthy."""
+        if self._smtp is not None and self._messages_on_connection >= MAX_MESSAGES_PER_CONNECTION:
+            self.close()
+
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.logger.info("SMTP session is no longer usable, reconnecting")
+            self.close()
+
+        smtp = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, context=_SSL_CONTEXT)
+        smtp.login(self.user, self.password)
+        self._smtp = smtp
+        self._messages_on_connection = 0
+        return smtp
@@ -0,0 +1,39 @@
+"""
+Tests for decoding fetched pages before parsing.
+"""
+
+import httpx
+import pytest
+
+from src.crawler.nadarzyn_bip.crawler import Crawler
+
+BODY = "<html><body><h3>Zażółć gęślą jaźń</h3></body></html>"
+
+
+@pytest.mark.parametrize(
+    "content_type, encoding",
+    [
+        ("text/html", "utf-8"),
+        ("text/html; charset=UTF-8", "utf-8"),
+        ("text/html; charset=iso-8859-2", "iso-8859-2"),
+        ("text/html; charset=windows-1250", "cp1250"),
+    ],
+)
+def test_parse_html_honours_header_charset(content_type, encoding):
+    response = httpx.Response(200, headers={"Content-Type": content_type}, content=BODY.encode(encoding))
+
+    assert Crawler._parse_html(response).css_first("h3").text() == "Zażółć gęślą jaźń"
+
+
+def test_parse_html_uses_meta_charset_without_header_charset():
+    body = BODY.replace("<html>", '<html><head><meta charset="iso-8859-2"></head>')
+    response = httpx.Response(200, headers={"Content-Type": "text/html"}, content=body.encode("iso-8859-2"))
+
+    assert Crawler._parse_html(response).css_first("h3").text() == "Zażółć gęślą jaźń"
+
+
+def test_parse_html_prefers_utf8_header_over_meta_charset():
+    body = BODY.replace("<html>", '<html><head><meta charset="windows-1250"></head>')
+    response = httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=body.encode())
+
+    assert Crawler._parse_html(response).css_first("h3").text() == "Zażółć gęślą jaźń"
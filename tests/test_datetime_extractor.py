@@ -0,0 +1,38 @@
+"""
+Tests for extracting dates from BIP metadata text.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.crawler.datetime_extractor import extract_datetime
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("05.03.2024", datetime(2024, 3, 5)),
+        ("Data publikacji: 05.03.2024 12:30", datetime(2024, 3, 5)),
+        ("2024-03-05", datetime(2024, 3, 5)),
+        ("2024-03-05 12:30", datetime(2024, 3, 5)),
+    ],
+)
+def test_extracts_both_formats_as_midnight_datetimes(text, expected):
+    assert extract_datetime(text) == expected
+
+
+@pytest.mark.parametrize("text", ["31.02.2025", "2025-13-01", "00.01.2025"])
+def test_invalid_date_returns_none(text):
+    assert extract_datetime(text) is None
+
+
+@pytest.mark.parametrize("text", [None, "", "brak daty", "5.3.2024", "123.03.20245"])
+def test_text_without_date_returns_none(text):
+    assert extract_datetime(text) is None
+
+
+def test_day_first_date_takes_precedence_over_an_iso_date():
+    assert extract_datetime("2024-01-02, zmieniono 05.03.2024") == datetime(2024, 3, 5)
+    assert extract_datetime("05.03.2024, zmieniono 2024-01-02") == datetime(2024, 3, 5)
+    assert extract_datetime("2024-01-02, zmieniono 31.02.2024") is None
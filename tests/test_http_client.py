@@ -0,0 +1,61 @@
+"""
+Tests for the per-host request rate limiter.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.crawler import http_client
+from src.crawler.http_client import RateLimiter
+
+
+class FakeClock:
+    """A monotonic clock that only moves when the rate limiter sleeps."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(http_client, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(http_client, "asyncio", SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep))
+    return clock
+
+
+def test_requests_to_one_host_are_spaced(clock):
+    limiter = RateLimiter(requests_per_second=2)
+
+    async def acquire_three():
+        times = []
+        for _ in range(3):
+            await limiter.acquire("bip.nadarzyn.pl")
+            times.append(clock.now)
+        return times
+
+    assert asyncio.run(acquire_three()) == pytest.approx([0.0, 0.5, 1.0])
+
+
+def test_hosts_are_limited_independently(clock):
+    limiter = RateLimiter(requests_per_second=2)
+
+    async def acquire_hosts():
+        await limiter.acquire("a.example")
+        await limiter.acquire("b.example")
+
+    asyncio.run(acquire_hosts())
+    assert clock.now == 0.0
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        RateLimiter(requests_per_second=0)
@@ -0,0 +1,99 @@
+"""
+Tests for duplicate detection in the item repository.
+"""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.item_repository import ITEM_DTYPES, ItemRepository, item_from_row
+from src.models import ContentItem
+
+
+def make_item(url: str = "https://bip.nadarzyn.pl/1#akapit_1", **fields) -> ContentItem:
+    return ContentItem(
+        url=url, main_title=fields.pop("main_title", "Tytuł"), title=fields.pop("title", "Tytuł"), **fields
+    )
+
+
+def test_filter_new_drops_known_items_and_repeats_within_batch():
+    known = make_item("https://bip.nadarzyn.pl/known")
+    repository = ItemRepository([known])
+    first = make_item("https://bip.nadarzyn.pl/a")
+    second = make_item("https://bip.nadarzyn.pl/b")
+
+    new_items = repository.filter_new(
+        [first, make_item("https://bip.nadarzyn.pl/known"), second, make_item("https://bip.nadarzyn.pl/a")]
+    )
+
+    assert new_items == [first, second]
+    assert repository.count == 1
+
+
+def test_filter_new_keeps_updated_items():
+    repository = ItemRepository([make_item()])
+    updated = make_item(last_modified_at=datetime.date(2025, 1, 2))
+
+    assert repository.filter_new([updated]) == [updated]
+
+
+def test_add_items_skips_duplicates():
+    repository = ItemRepository()
+
+    assert repository.add_items([make_item(), make_item(), make_item(title="Inny")]) == 2
+    assert repository.add_item(make_item()) is False
+    assert repository.count == 2
+
+
+CSV_HEADER = "url,main_title,title,description,attachment_url,published_at,created_at,last_modified_at\n"
+
+
+def read_history(tmp_path, rows: str) -> pd.DataFrame:
+    """Read a history file the same way main.read_past_csv does."""
+    csv_path = tmp_path / "items.csv"
+    csv_path.write_text(CSV_HEADER + rows, encoding="utf-8")
+    return pd.read_csv(csv_path, dtype=ITEM_DTYPES, keep_default_na=False, index_col=False)
+
+
+def test_from_dataframe_loads_date_columns_without_any_value(tmp_path):
+    df = read_history(tmp_path, "https://x,M,T,,,2025-01-01,,\n")
+
+    (item,) = ItemRepository.from_dataframe(df).items
+
+    assert item == make_item("https://x", main_title="M", title="T", published_at=datetime.date(2025, 1, 1))
+
+
+def test_from_dataframe_rejects_malformed_dates(tmp_path):
+    df = read_history(tmp_path, "https://x,M,T,,,2025-01-01,,\nhttps://y,M,T,,,2025-02-30,,\n")
+
+    with pytest.raises(ValueError):
+        ItemRepository.from_dataframe(df)
+
+
+# pandas warns about the dropped extra cell
+@pytest.mark.filterwarnings("ignore::pandas.errors.ParserWarning")
+@pytest.mark.parametrize(
+    "row",
+    [
+        ",,,,,,,",
+        "None,NA,N/A,null,,,,",
+        "https://x,M,T,NA,None,2025-01-01,,",
+        "https://x,M,T,D,,2025-01-01,,,extra",
+    ],
+    ids=["empty-required", "na-tokens", "na-optional", "extra-cell"],
+)
+def test_csv_and_dataframe_loaders_build_the_same_item(tmp_path, row):
+    df = read_history(tmp_path, row + "\n")
+
+    from_csv = ItemRepository.from_csv(str(tmp_path / "items.csv")).items
+    from_dataframe = ItemRepository.from_dataframe(df).items
+
+    assert from_csv == from_dataframe
+    assert len(from_csv) == 1
+
+
+def test_item_from_row_normalises_missing_values():
+    item = item_from_row({"url": "", "main_title": "NA", "title": "T", "description": "N/A", "published_at": ""})
+
+    assert item == make_item("None", main_title="None", title="T")
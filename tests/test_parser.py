@@ -0,0 +1,82 @@
+"""
+Tests for parsing BIP search and article pages.
+"""
+
+import pytest
+from selectolax.lexbor import LexborHTMLParser
+
+from src.crawler.nadarzyn_bip.base_parser import ParseContext
+from src.crawler.nadarzyn_bip.parser import ArticleAttachmentParser, SearchPageConfiguratorParser
+
+PAGE = """
+<div class="obiekt_akapit" id="akapit_1">
+    <h3>First</h3>
+    <ul class="obiekt_pliki"><li id="plik_5"><a class="pliki_link" href="/plik,5,a.pdf">a.pdf</a></li>
+    <li id="plik_6"><a class="pliki_link" href="//cdn.nadarzyn.pl/plik,6,c.pdf">c.pdf</a></li></ul>
+</div>
+<div class="obiekt_akapit" id="akapit_2">
+    <h3>Second</h3>
+    <ul class="obiekt_pliki"><li id="plik_7"><a class="pliki_link" href="/plik,7,b.pdf">b.pdf</a></li></ul>
+</div>
+"""
+
+SEARCH_PAGE = '<form><input type="hidden" name="_session_antiCSRF" value="a+b/c"></form>'
+
+
+def parse_attachment(anchor: str):
+    ctx = ParseContext(f"https://bip.nadarzyn.pl/73,komunikaty?tresc=1#{anchor}", LexborHTMLParser(PAGE))
+    parser = ArticleAttachmentParser()
+    assert parser.can_parse(ctx)
+    (item,) = parser.parse(ctx)
+    return item
+
+
+def test_attachment_of_first_article():
+    item = parse_attachment("plik_5")
+
+    assert item.main_title == "First"
+    assert item.title == "a.pdf"
+    assert item.attachment_url == "https://bip.nadarzyn.pl/plik,5,a.pdf"
+
+
+def test_attachment_of_later_article_is_read_from_first_article():
+    item = parse_attachment("plik_7")
+
+    assert item.main_title == "First"
+    assert item.title == "Brak nazwy"
+    assert item.attachment_url is None
+
+
+def test_protocol_relative_attachment_url_is_kept_unchanged():
+    assert parse_attachment("plik_6").attachment_url == "//cdn.nadarzyn.pl/plik,6,c.pdf"
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        (
+            "https://bip.nadarzyn.pl/redir,szukaj?szukaj=x",
+            "https://bip.nadarzyn.pl/redir,szukaj?szukaj=x&_session_antiCSRF=a%2Bb%2Fc",
+        ),
+        (
+            "https://bip.nadarzyn.pl/redir,szukaj",
+            "https://bip.nadarzyn.pl/redir,szukaj?_session_antiCSRF=a%2Bb%2Fc",
+        ),
+        (
+            "https://bip.nadarzyn.pl/redir,szukaj?szukaj=x#wyniki",
+            "https://bip.nadarzyn.pl/redir,szukaj?szukaj=x&_session_antiCSRF=a%2Bb%2Fc#wyniki",
+        ),
+        (
+            "https://bip.nadarzyn.pl/redir,szukaj#wyniki?a",
+            "https://bip.nadarzyn.pl/redir,szukaj?_session_antiCSRF=a%2Bb%2Fc#wyniki?a",
+        ),
+    ],
+)
+def test_search_url_gets_the_token_before_the_fragment(url, expected):
+    ctx = ParseContext(url, LexborHTMLParser(SEARCH_PAGE))
+    parser = SearchPageConfiguratorParser()
+    assert parser.can_parse(ctx)
+
+    (item,) = parser.parse(ctx)
+
+    assert item.url == expected
@@ -0,0 +1,45 @@
+"""
+Tests for the URL helpers used by the parsers.
+"""
+
+from urllib.parse import urlencode
+
+import pytest
+
+from src.crawler.url_manipulation import encode_query, get_origin, resolve_url
+
+PAGE_URL = "https://bip.nadarzyn.pl/73,komunikaty?tresc=1#plik_2"
+
+
+@pytest.mark.parametrize(
+    "href, expected",
+    [
+        ("https://example.com/a?b=1", "https://example.com/a?b=1"),
+        ("http://example.com/a", "http://example.com/a"),
+        ("/plik,21461,wykaz.pdf", "https://bip.nadarzyn.pl/plik,21461,wykaz.pdf"),
+        ("//cdn.example.com/x.pdf", "https://cdn.example.com/x.pdf"),
+        ("plik,1,a.pdf", "https://bip.nadarzyn.pl/plik,1,a.pdf"),
+        ("../a/b", "https://bip.nadarzyn.pl/a/b"),
+        ("?tresc=2", "https://bip.nadarzyn.pl/73,komunikaty?tresc=2"),
+    ],
+)
+def test_resolve_url(href, expected):
+    assert resolve_url(PAGE_URL, href) == expected
+
+
+def test_get_origin():
+    assert get_origin(PAGE_URL) == "https://bip.nadarzyn.pl"
+    assert get_origin("not a url") == "not a url"
+
+
+@pytest.mark.parametrize(
+    "query_params",
+    [
+        {},
+        {"szukaj": ["kajetany"], "szukaj_limit": ["100"]},
+        {"a": ["1", "2"], "b": []},
+        {"q": "a b&c=d/ę", "key with space": ["x+y", "ż%"]},
+    ],
+)
+def test_encode_query_matches_urlencode(query_params):
+    assert encode_query(query_params) == urlencode(query_params, doseq=True)